@@ -2,11 +2,28 @@
 from __future__ import annotations
 
 import json
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, Iterator, Optional, Union
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
 from urllib.parse import urljoin
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:  # pragma: no cover - optional speed-up
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
+
+try:  # pragma: no cover - optional HTTP/2 transport
+    import httpx
+except ImportError:  # pragma: no cover - requests is used by default
+    httpx = None
+
+# Multi-value filters (``?name=a&name=b``) are passed as lists.
+QueryParams = Dict[str, Union[str, int, List[str]]]
 
 
 class NetBoxAPIError(RuntimeError):
@@ -20,27 +37,84 @@ class NetBoxAPIError(RuntimeError):
 
 @dataclass
 class NetBoxClient:
-    """Small helper around :mod:`requests` to talk to NetBox."""
+    """Small helper around :mod:`requests` to talk to NetBox.
+
+    Setting ``http2`` switches the transport to :mod:`httpx` so that concurrent
+    requests share a single multiplexed connection.
+    """
 
     base_url: str
     token: Optional[str] = None
     verify: Union[bool, str] = True
     timeout: int = 60
+    http2: bool = False
 
     def __post_init__(self) -> None:
         if not self.base_url:
             raise ValueError("NetBox base URL must be provided")
         if not self.base_url.endswith('/'):
             self.base_url = f"{self.base_url}/"
-        self._session = requests.Session()
-        self._session.headers.update({"Accept": "application/json"})
+        # Normalised ``<resource>/`` prefixes used to build object URLs.
+        self._resource_paths: Dict[str, str] = {}
+        headers = {"Accept": "application/json"}
         if self.token:
-            self._session.headers.update({"Authorization": f"Token {self.token}"})
+            headers["Authorization"] = f"Token {self.token}"
+        if self.http2:
+            self._session = self._http2_session(headers)
+            # TLS verification is fixed on the httpx client and cannot be passed per request.
+            self._request_options = {"timeout": self.timeout}
+            return
+
+        self._session = requests.Session()
+        # Back off and retry when NetBox is rate limiting or temporarily unavailable.
+        retries = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            raise_on_status=False,
+        )
+        # A single host is contacted, but concurrent page fetches and lookup bursts
+        # need more pooled keep-alive connections than the default of ten.
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=64, max_retries=retries)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._session.headers.update(headers)
+        self._session.headers["Connection"] = "keep-alive"
+        self._request_options = {"timeout": self.timeout, "verify": self.verify}
+
+    def _http2_session(self, headers: Dict[str, str]) -> "httpx.Client":
+        """Build an HTTP/2 client multiplexing concurrent requests over one connection."""
+
+        if httpx is None:
+            raise ValueError("HTTP/2 support requires the httpx package installed with its http2 extra")
+        limits = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+        # httpx only retries failed connection attempts, not 429/5xx responses.
+        transport = httpx.HTTPTransport(http2=True, verify=self.verify, limits=limits, retries=3)
+        # Follow redirects like requests does, e.g. Django's APPEND_SLASH 301 for
+        # resources given without a trailing slash.
+        return httpx.Client(transport=transport, headers=headers, timeout=self.timeout, follow_redirects=True)
+
+    def __enter__(self) -> "NetBoxClient":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
 
-    def _request(self, method: str, path: str, params: Optional[Dict[str, Union[str, int]]] = None) -> requests.Response:
+    def close(self) -> None:
+        """Release pooled connections held by the underlying session."""
+
+        self._session.close()
+
+    def _request(self, method: str, path: str, params: Optional[QueryParams] = None) -> requests.Response:
         url = urljoin(self.base_url, path.lstrip('/'))
-        response = self._session.request(method, url, params=params, timeout=self.timeout, verify=self.verify)
-        if not response.ok:
+        response = self._session.request(method, url, params=params, **self._request_options)
+        return self._check(response)
+
+    @staticmethod
+    def _check(response: requests.Response) -> requests.Response:
+        # ``status_code`` is shared by requests and httpx responses, ``ok`` is not.
+        # Redirects are followed by both transports, so a 3xx left here is unexpected.
+        if response.status_code >= 300:
             try:
                 payload = response.json()
             except ValueError:
@@ -52,64 +126,168 @@ class NetBoxClient:
             )
         return response
 
+    @staticmethod
+    def _decode(response: requests.Response) -> object:
+        # Parse the raw body instead of ``response.json()``, which first decodes
+        # the whole page into a ``str``; both parsers detect UTF-8/16/32 from bytes.
+        try:
+            if orjson is not None:
+                return orjson.loads(response.content)
+            return json.loads(response.content)
+        except ValueError as exc:
+            raise NetBoxAPIError("NetBox API returned non JSON response", payload={"raw": response.text}) from exc
+
+    def _get_json(self, path: str, params: Optional[QueryParams] = None) -> object:
+        return self._decode(self._request("GET", path, params=params))
+
+    def _follow(self, next_url: str) -> object:
+        """Fetch a pagination link; NetBox returns these fully qualified with their query."""
+
+        response = self._session.get(next_url, **self._request_options)
+        return self._decode(self._check(response))
+
+    @staticmethod
+    def _split_page(data: object) -> Tuple[List[dict], Optional[str]]:
+        """Return the objects contained in a response and the URL of the next page."""
+
+        if isinstance(data, dict):
+            results = data.get("results")
+            if results is not None:
+                return results, data.get("next")
+            # Single object response
+            return [data], None
+        if isinstance(data, list):
+            return data, None
+        raise NetBoxAPIError(
+            "Unexpected response structure from NetBox",
+            payload={"raw": data},
+        )
+
     def iter_resource(
         self,
         resource: str,
-        params: Optional[Dict[str, Union[str, int]]] = None,
+        params: Optional[QueryParams] = None,
+        fields: Optional[Sequence[str]] = None,
+        prefetch: bool = True,
     ) -> Iterator[dict]:
-        """Iterate over all objects of the given resource handling pagination automatically."""
+        """Iterate over all objects of the given resource handling pagination automatically.
+
+        When ``fields`` is given only those attributes are requested (NetBox 4.0+
+        honours ``?fields=``; older releases ignore it and return full objects).
+        With ``prefetch`` the next page is requested while the current one is
+        being consumed.
+        """
 
         next_url: Optional[str] = None
         current_params = dict(params or {})
-        while True:
-            response = self._request("GET", next_url or resource, params=current_params if not next_url else None)
-            try:
-                data = response.json()
-            except ValueError as exc:
-                raise NetBoxAPIError("NetBox API returned non JSON response", payload={"raw": response.text}) from exc
-
-            if isinstance(data, dict) and {"results", "next"}.issubset(data.keys()):
-                for item in data.get("results", []):
+        if fields:
+            current_params["fields"] = ",".join(fields)
+        executor = ThreadPoolExecutor(max_workers=1)
+        future: Optional[Future] = None
+        try:
+            data = self._get_json(resource, params=current_params)
+            while True:
+                items, next_url = self._split_page(data)
+                # Preload the next page while the caller consumes the current one.
+                # Errors raised by the prefetch surface from ``result()`` below.
+                future = executor.submit(self._follow, next_url) if next_url and prefetch else None
+                for item in items:
                     yield item
-                next_url = data.get("next")
-                if not next_url:
+                if future is not None:
+                    data = future.result()
+                elif next_url:
+                    data = self._follow(next_url)
+                else:
                     break
-                current_params = None
-            elif isinstance(data, list):
-                for item in data:
+        finally:
+            # The caller may stop early; do not wait for a page nobody will read.
+            if future is not None:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def iter_resource_concurrent(
+        self,
+        resource: str,
+        params: Optional[QueryParams] = None,
+        workers: int = 4,
+    ) -> Iterator[dict]:
+        """Iterate over all objects of the given resource fetching pages concurrently.
+
+        The first page is requested as usual; the ``count`` it reports is used to
+        compute the ``offset`` of every remaining page, which are then fetched by
+        up to ``workers`` threads. Objects are yielded in the same order as
+        :meth:`iter_resource`, so callers may keep consuming them from a single
+        thread.
+        """
+
+        if workers <= 1:
+            yield from self.iter_resource(resource, params=params)
+            return
+
+        base_params = dict(params or {})
+        data = self._get_json(resource, params=base_params)
+        items, next_url = self._split_page(data)
+        for item in items:
+            yield item
+        if not next_url:
+            return
+
+        count = data.get("count") if isinstance(data, dict) else None
+        page_size = len(items)
+        if not isinstance(count, int) or not page_size:
+            # Offsets cannot be computed, follow the ``next`` links instead.
+            while next_url:
+                items, next_url = self._split_page(self._follow(next_url))
+                for item in items:
                     yield item
-                break
-            elif isinstance(data, dict):
-                # Single object response
-                yield data
-                break
-            else:
-                raise NetBoxAPIError(
-                    "Unexpected response structure from NetBox",
-                    payload={"raw": json.dumps(data)},
-                )
+            return
+
+        start = int(base_params.get("offset", 0)) + page_size
+        offsets = iter(range(start, count, page_size))
+
+        def fetch(offset: int) -> object:
+            page_params = dict(base_params)
+            page_params.update({"limit": page_size, "offset": offset})
+            return self._get_json(resource, params=page_params)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = deque(executor.submit(fetch, offset) for _, offset in zip(range(workers), offsets))
+            try:
+                while pending:
+                    data = pending.popleft().result()
+                    offset = next(offsets, None)
+                    if offset is not None:
+                        pending.append(executor.submit(fetch, offset))
+                    items, _ = self._split_page(data)
+                    for item in items:
+                        yield item
+            finally:
+                for future in pending:
+                    future.cancel()
 
     def get_first(
         self,
         resource: str,
-        params: Optional[Dict[str, Union[str, int]]] = None,
+        params: Optional[QueryParams] = None,
+        fields: Optional[Sequence[str]] = None,
     ) -> Optional[dict]:
         """Return the first item for the resource matching the parameters."""
 
-        for item in self.iter_resource(resource, params=params):
-            return item
-        return None
+        iterator = self.iter_resource(resource, params=params, fields=fields, prefetch=False)
+        try:
+            return next(iterator, None)
+        finally:
+            iterator.close()
 
     def get_by_id(self, resource: str, object_id: Union[str, int]) -> Optional[dict]:
         """Fetch a single object by its numeric identifier."""
 
         try:
-            response = self._request("GET", f"{resource.rstrip('/')}/{object_id}/")
+            prefix = self._resource_paths.get(resource)
+            if prefix is None:
+                prefix = self._resource_paths[resource] = f"{resource.rstrip('/')}/"
+            return self._get_json(f"{prefix}{object_id}/")
         except NetBoxAPIError as exc:
             if exc.status == 404:
                 return None
             raise
-        try:
-            return response.json()
-        except ValueError as exc:
-            raise NetBoxAPIError("NetBox API returned non JSON response", payload={"raw": response.text}) from exc
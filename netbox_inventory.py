@@ -1,16 +1,33 @@
 """Splunk modular input that periodically exports NetBox objects."""
 from __future__ import annotations
 
+import calendar
 import json
+import re
 from datetime import datetime
+from functools import partial
 from typing import Dict, Iterator, Optional
 
 from splunklib.modularinput import Argument, Event, Scheme, Script
 
 from netbox_client import NetBoxClient
 
+try:  # pragma: no cover - optional speed-up
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 
 ISO_FORMATS = ("%Y-%m-%dT%H:%M:%S.%f%z", "%Y-%m-%dT%H:%M:%S%z")
+# Fast path for the timestamps NetBox emits; anything else falls back to ISO_FORMATS.
+_ISO_RE = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})(?:\.(\d{1,6}))?(?:Z|([+-])(\d{2}):?(\d{2}))$",
+    re.ASCII,
+)
+_timegm = calendar.timegm
+_monthrange = calendar.monthrange
 
 
 def _parse_bool(value: Optional[str], default: bool = True) -> bool:
@@ -26,26 +43,71 @@ def _parse_json(value: Optional[str]) -> Dict[str, str]:
     if not value:
         return {}
     try:
-        data = json.loads(value)
+        data = _json_loads(value)
     except json.JSONDecodeError as exc:
         raise ValueError("Failed to parse JSON payload for query parameters") from exc
     if not isinstance(data, dict):
         raise ValueError("Query parameters must be provided as a JSON object")
+    # Filters are usually all strings already; only copy when coercion is needed.
+    if all(isinstance(k, str) and isinstance(v, str) for k, v in data.items()):
+        return data
     return {str(k): str(v) for k, v in data.items()}
 
 
+# The serializer is chosen once here instead of on every event.
+if orjson is not None:
+    def _dumps(payload: Dict[str, object], _encode=orjson.dumps) -> str:
+        return _encode(payload).decode("utf-8")
+else:
+    _dumps = partial(json.dumps, ensure_ascii=False)
+
+
+def _parse_iso(text: str) -> Optional[float]:
+    match = _ISO_RE.match(text)
+    if match is not None:
+        year, month, day, hour, minute, second, fraction, sign, tz_hour, tz_minute = match.groups()
+        year, month, day = int(year), int(month), int(day)
+        hour, minute, second = int(hour), int(minute), int(second)
+        offset = int(tz_hour) * 3600 + int(tz_minute) * 60 if sign else 0
+        # ``timegm`` silently normalises out-of-range fields (Feb 30 -> Mar 1),
+        # so only trust the fast path for values strptime would accept too.
+        if (
+            year >= 1
+            and 1 <= month <= 12
+            and 1 <= day <= _monthrange(year, month)[1]
+            and hour < 24
+            and minute < 60
+            and second < 60
+            and offset < 86400
+            and (not sign or int(tz_minute) < 60)
+        ):
+            seconds = _timegm((year, month, day, hour, minute, second, 0, 0, 0))
+            seconds += -offset if sign == "+" else offset
+            if fraction:
+                return seconds + int(fraction) / 10 ** len(fraction)
+            return float(seconds)
+    for fmt in ISO_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).timestamp()
+        except ValueError:
+            continue
+    return None
+
+
 def _guess_event_time(payload: Dict[str, object]) -> Optional[float]:
-    for key in ("last_updated", "last_update", "created"):
+    # Nearly every NetBox object carries ``last_updated``, so try it first directly.
+    value = payload.get("last_updated")
+    if value.__class__ is str:
+        timestamp = _parse_iso(value.strip())
+        if timestamp is not None:
+            return timestamp
+    for key in ("last_update", "created"):
         value = payload.get(key)
-        if not isinstance(value, str):
+        if value.__class__ is not str:
             continue
-        text = value.strip()
-        for fmt in ISO_FORMATS:
-            try:
-                dt = datetime.strptime(text, fmt)
-                return dt.timestamp()
-            except ValueError:
-                continue
+        timestamp = _parse_iso(value.strip())
+        if timestamp is not None:
+            return timestamp
     return None
 
 
@@ -106,6 +168,22 @@ class NetBoxInventoryInput(Script):
                 required_on_create=False,
             )
         )
+        scheme.add_argument(
+            Argument(
+                "http2",
+                title="HTTP/2",
+                description="Use HTTP/2 through the optional httpx package (true/false). Defaults to false.",
+                required_on_create=False,
+            )
+        )
+        scheme.add_argument(
+            Argument(
+                "concurrency",
+                title="Concurrency",
+                description="Number of result pages fetched in parallel. Defaults to 4; use 1 to fetch pages sequentially.",
+                required_on_create=False,
+            )
+        )
         return scheme
 
     def validate_input(self, definition):  # type: ignore[override]
@@ -118,6 +196,9 @@ class NetBoxInventoryInput(Script):
         timeout = definition.parameters.get("timeout")
         if timeout:
             int(timeout)
+        concurrency = definition.parameters.get("concurrency")
+        if concurrency and int(concurrency) < 1:
+            raise ValueError("Concurrency must be a positive integer")
 
     def stream_events(self, inputs, ew):  # type: ignore[override]
         for name, stanza in inputs.inputs.items():
@@ -126,30 +207,34 @@ class NetBoxInventoryInput(Script):
             resource = stanza.get("resource")
             query = _parse_json(stanza.get("query"))
             verify_ssl = _parse_bool(stanza.get("verify_ssl"), default=True)
+            http2 = _parse_bool(stanza.get("http2"), default=False)
             timeout = stanza.get("timeout")
             timeout_seconds = int(timeout) if timeout else 60
+            concurrency = stanza.get("concurrency")
+            workers = int(concurrency) if concurrency else 4
 
-            client = NetBoxClient(base_url, token=token, verify=verify_ssl, timeout=timeout_seconds)
             sourcetype = f"netbox:{resource.replace('/', '_')}"
 
-            try:
-                iterator: Iterator[dict] = client.iter_resource(resource, params=query)
-            except Exception as exc:  # pragma: no cover - surfaced to Splunk logs
-                raise RuntimeError(f"Failed to create NetBox iterator for stanza '{name}': {exc}") from exc
-
-            for item in iterator:
-                payload = json.dumps(item, ensure_ascii=False)
-                event_time = _guess_event_time(item)
-                event = Event(
-                    data=payload,
-                    stanza=name,
-                    sourcetype=sourcetype,
-                )
-                if event_time is not None:
-                    event.time = event_time
-                if "name" in item and isinstance(item["name"], str):
-                    event.host = item["name"]
-                ew.write_event(event)
+            client = NetBoxClient(base_url, token=token, verify=verify_ssl, timeout=timeout_seconds, http2=http2)
+            with client:
+                try:
+                    iterator: Iterator[dict] = client.iter_resource_concurrent(resource, params=query, workers=workers)
+                except Exception as exc:  # pragma: no cover - surfaced to Splunk logs
+                    raise RuntimeError(f"Failed to create NetBox iterator for stanza '{name}': {exc}") from exc
+
+                # Bind per-event helpers to locals; this loop runs once per NetBox object.
+                dumps = _dumps
+                guess_time = _guess_event_time
+                write_event = ew.write_event
+                # EventWriter serialises the event synchronously, so a single
+                # instance can be refilled for every object.
+                event = Event(stanza=name, sourcetype=sourcetype)
+                for item in iterator:
+                    event.data = dumps(item)
+                    event.time = guess_time(item)
+                    host = item.get("name")
+                    event.host = host if host.__class__ is str else None
+                    write_event(event)
 
 
 if __name__ == "__main__":
@@ -2,11 +2,36 @@
 from __future__ import annotations
 
 import json
-from typing import Dict, Iterable, Optional
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+from urllib.parse import urlencode
 
 from splunklib.searchcommands import Configuration, Option, StreamingCommand, dispatch
 
-from netbox_client import NetBoxClient
+from netbox_client import NetBoxClient, QueryParams
+
+try:  # pragma: no cover - optional speed-up
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Number of distinct match values resolved by a single NetBox query.
+BATCH_SIZE = 100
+# Budget for the encoded match values of one query. NetBox copies them into
+# every ``next`` link, and gunicorn rejects request lines over 4094 bytes.
+MAX_BATCH_QUERY_LENGTH = 2048
+# Upper bound on records held back while a batch is being filled.
+MAX_BUFFERED_RECORDS = 1000
+# Maximum number of lookup results remembered for the lifetime of the command.
+CACHE_SIZE = 100_000
+# Lower bound used when whole objects are cached as serialised ``netbox`` values.
+FULL_PAYLOAD_CACHE_SIZE = 10_000
+
+# What a lookup adds to an event: the selected ``netbox_*`` fields, the full
+# serialised object, or ``None`` when NetBox has no match.
+Enrichment = Optional[Union[Dict[str, object], str]]
 
 
 def _parse_fields(value: Optional[str]) -> Optional[Iterable[str]]:
@@ -16,6 +41,22 @@ def _parse_fields(value: Optional[str]) -> Optional[Iterable[str]]:
     return parts or None
 
 
+def _chunk_keys(field: str, keys: List[str]) -> Iterator[List[str]]:
+    """Split match values so each query string stays within MAX_BATCH_QUERY_LENGTH."""
+
+    chunk: List[str] = []
+    length = 0
+    for key in keys:
+        size = len(urlencode({field: key})) + 1
+        if chunk and length + size > MAX_BATCH_QUERY_LENGTH:
+            yield chunk
+            chunk, length = [], 0
+        chunk.append(key)
+        length += size
+    if chunk:
+        yield chunk
+
+
 @Configuration()
 class NetBoxLookupCommand(StreamingCommand):
     """Enrich Splunk events with attributes fetched from NetBox."""
@@ -28,53 +69,175 @@ class NetBoxLookupCommand(StreamingCommand):
     fields = Option(require=False, doc="Comma separated list of NetBox fields to copy into the event.")
     verify_ssl = Option(require=False, default="true", doc="Whether to verify SSL certificates.")
     timeout = Option(require=False, default="60", doc="HTTP timeout in seconds.")
+    http2 = Option(require=False, default="false", doc="Whether to use HTTP/2 through the optional httpx package.")
     query = Option(require=False, doc="Additional static filters encoded as JSON.")
 
-    def _get_client(self) -> NetBoxClient:
+    def __init__(self) -> None:
+        super().__init__()
+        # Enrichments, including misses (``None``), kept across ``stream`` calls
+        # so values repeated in later chunks of the search are not queried again.
+        self._cache: "OrderedDict[str, Enrichment]" = OrderedDict()
+        # Derived from the options on the first ``stream`` call.
+        self._client: Optional[NetBoxClient] = None
+        self._base_filters: Dict[str, str] = {}
+        self._field_list: Optional[List[str]] = None
+        self._request_fields: Optional[List[str]] = None
+
+    def _make_client(self) -> NetBoxClient:
         verify_ssl = str(self.verify_ssl).strip().lower() in {"1", "true", "yes", "on"}
+        http2 = str(self.http2).strip().lower() in {"1", "true", "yes", "on"}
         timeout_seconds = int(self.timeout)
-        return NetBoxClient(self.netbox_url, token=self.token or None, verify=verify_ssl, timeout=timeout_seconds)
-
-    def _base_filters(self) -> Dict[str, str]:
+        return NetBoxClient(
+            self.netbox_url,
+            token=self.token or None,
+            verify=verify_ssl,
+            timeout=timeout_seconds,
+            http2=http2,
+        )
+
+    def _parse_base_filters(self) -> Dict[str, str]:
         if not self.query:
             return {}
         try:
-            payload = json.loads(self.query)
+            payload = _json_loads(self.query)
         except json.JSONDecodeError as exc:
             raise ValueError("Query filters must be a JSON object") from exc
         if not isinstance(payload, dict):
             raise ValueError("Query filters must be a JSON object")
+        if all(isinstance(k, str) and isinstance(v, str) for k, v in payload.items()):
+            return payload
         return {str(k): str(v) for k, v in payload.items()}
 
+    def _configure(self) -> None:
+        """Parse the command options once; Splunk sets them before the first chunk."""
+
+        self._base_filters = self._parse_base_filters()
+        self._field_list = list(_parse_fields(self.fields) or [])
+        # Only fetch what is copied into events, plus the field batches are matched on.
+        self._request_fields = (
+            list(dict.fromkeys([*self._field_list, self.netbox_field])) if self._field_list else None
+        )
+
+    def _lookup_batch(self, keys: List[str]) -> Dict[str, Optional[dict]]:
+        """Resolve many match values with as few multi-value filter queries as possible."""
+
+        results: Dict[str, Optional[dict]] = {}
+        for chunk in _chunk_keys(self.netbox_field, keys):
+            results.update(self._lookup_chunk(chunk))
+        return results
+
+    def _lookup_chunk(self, keys: List[str]) -> Dict[str, Optional[dict]]:
+        """Resolve match values with a single multi-value filter query."""
+
+        client = self._client
+        params: QueryParams = dict(self._base_filters)
+        params[self.netbox_field] = keys
+        wanted = set(keys)
+        found: Dict[str, dict] = {}
+        folded = set()
+        unmatched = False
+        for item in client.iter_resource(self.resource, params=params, fields=self._request_fields):
+            value = item.get(self.netbox_field)
+            key = str(value) if isinstance(value, (str, int)) else None
+            if key is None:
+                unmatched = True
+                continue
+            folded.add(key.casefold())
+            if key in wanted:
+                found.setdefault(key, item)
+            else:
+                unmatched = True
+
+        results: Dict[str, Optional[dict]] = {}
+        for key in keys:
+            payload = found.get(key)
+            if payload is None and (unmatched or key.casefold() in folded):
+                # NetBox may match values differently than a plain string comparison
+                # (case folding, nested fields). An exact match for ``dev1`` may also
+                # be what a case-insensitive filter returns for ``DEV1``, so confirm
+                # such misses one by one.
+                params = dict(self._base_filters)
+                params[self.netbox_field] = key
+                payload = client.get_first(self.resource, params=params, fields=self._request_fields)
+            results[key] = payload
+        return results
+
+    def _project(self, payload: Optional[dict]) -> Enrichment:
+        """Reduce a NetBox object to what ``_enrich`` adds to events, for caching."""
+
+        if not payload:
+            return None
+        if self._field_list:
+            return {f"netbox_{field}": payload.get(field) for field in self._field_list}
+        return json.dumps(payload, ensure_ascii=False)
+
+    @staticmethod
+    def _enrich(record: dict, enrichment: Enrichment) -> dict:
+        if enrichment is None:
+            return record
+        if isinstance(enrichment, str):
+            record.setdefault("netbox", enrichment)
+        else:
+            record.update(enrichment)
+        return record
+
+    def _remember(self, results: Dict[str, Enrichment]) -> None:
+        cache = self._cache
+        cache.update(results)
+        limit = CACHE_SIZE if self._field_list else FULL_PAYLOAD_CACHE_SIZE
+        while len(cache) > limit:
+            cache.popitem(last=False)
+
     def stream(self, records):  # type: ignore[override]
-        client = self._get_client()
-        base_filters = self._base_filters()
-        field_list = list(_parse_fields(self.fields) or [])
-        cache: Dict[str, Optional[dict]] = {}
+        if self._field_list is None:
+            self._configure()
+        if self._client is None:
+            self._client = self._make_client()
+        cache = self._cache
+        buffered: List[dict] = []
+        pending: Dict[str, None] = {}
+        # Enrichments for the buffered records, independent of cache evictions.
+        known: Dict[str, Enrichment] = {}
+
+        def flush() -> Iterator[dict]:
+            if pending:
+                resolved = {key: self._project(payload) for key, payload in self._lookup_batch(list(pending)).items()}
+                pending.clear()
+                self._remember(resolved)
+                known.update(resolved)
+            for record in buffered:
+                value = record.get(self.match_field)
+                yield self._enrich(record, known[str(value)]) if value else record
+            buffered.clear()
+            known.clear()
 
         for record in records:
             value = record.get(self.match_field)
-            if not value:
+            if value:
+                key = str(value)
+                if key in cache:
+                    cache.move_to_end(key)
+                    if not buffered:
+                        yield self._enrich(record, cache[key])
+                        continue
+                    known[key] = cache[key]
+                else:
+                    pending[key] = None
+            elif not buffered:
                 yield record
                 continue
 
-            cache_key = str(value)
-            if cache_key not in cache:
-                params = dict(base_filters)
-                params[self.netbox_field] = cache_key
-                cache[cache_key] = client.get_first(self.resource, params=params)
+            buffered.append(record)
+            if len(pending) >= BATCH_SIZE or len(buffered) >= MAX_BUFFERED_RECORDS:
+                yield from flush()
 
-            payload = cache[cache_key]
-            if not payload:
-                yield record
-                continue
+        yield from flush()
 
-            if field_list:
-                for field in field_list:
-                    record[f"netbox_{field}"] = payload.get(field)
-            else:
-                record.setdefault("netbox", json.dumps(payload, ensure_ascii=False))
-            yield record
+        # splunklib does not call finish() after a successful chunked search, so
+        # release the pooled connections once Splunk has sent the final chunk.
+        if getattr(self, "_finished", False):
+            self._client.close()
+            self._client = None
 
 
 def dispatch_netbox_lookup_command():